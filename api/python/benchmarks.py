@@ -0,0 +1,666 @@
+"""Offline benchmarks for the stats pipeline.
+
+Usage: python3 api/python/benchmarks.py [name ...]
+
+The replay benchmark runs against REPLAY_ARCHIVE (recorded with
+api/python/recording.py) or a synthetic night, at REPLAY_SPEED ("max" or a
+multiple of real time).
+"""
+
+import copy
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import vendor_path  # noqa: F401  (nba_api from vendor/nba_api)
+from nba_api.live.nba.endpoints import boxscore, playbyplay, scoreboard
+from nba_api.live.nba.library.http import NBALiveHTTP
+
+
+class StubCDNServer:
+    """Local HTTP server standing in for cdn.nba.com.
+
+    Every request is answered with `payload` after sleeping `delay` seconds.
+    While running, NBALiveHTTP requests are pointed at this server.
+    """
+
+    def __init__(self, payload, delay=0.0):
+        body = json.dumps(payload).encode("utf-8")
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(delay)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._base_url = None
+
+    def __enter__(self):
+        self.thread.start()
+        self._base_url = NBALiveHTTP.base_url
+        NBALiveHTTP.base_url = (
+            "http://127.0.0.1:{}/".format(self.server.server_port) + "{endpoint}"
+        )
+        return self
+
+    def __exit__(self, *exc):
+        NBALiveHTTP.base_url = self._base_url
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# Concurrent box score fetches must beat sequential ones by at least this much
+FANOUT_MIN_SPEEDUP = float(os.environ.get("FANOUT_MIN_SPEEDUP", 4))
+
+
+def bench_box_score_fanout(games=12, delay=0.2, min_speedup=FANOUT_MIN_SPEEDUP):
+    """Compare sequential and concurrent box score fetches.
+
+    Fails when a fetch fails or the speedup is below `min_speedup` (env
+    FANOUT_MIN_SPEEDUP).
+    """
+    import stats
+
+    game_ids = ["00224{:05d}".format(i) for i in range(games)]
+    cache = NBALiveHTTP.cache
+    NBALiveHTTP.cache = None
+    try:
+        with StubCDNServer(boxscore.BoxScore.expected_data, delay=delay):
+            start = time.perf_counter()
+            for game_id in game_ids:
+                stats.fetch_box_score(game_id)
+            sequential = time.perf_counter() - start
+
+            start = time.perf_counter()
+            results = stats.fetch_box_scores(game_ids)
+            concurrent = time.perf_counter() - start
+    finally:
+        NBALiveHTTP.cache = cache
+
+    failed = [g for g, r in results.items() if isinstance(r, Exception)]
+    speedup = sequential / concurrent
+    return {
+        "games": games,
+        "delay": delay,
+        "sequential": round(sequential, 3),
+        "concurrent": round(concurrent, 3),
+        "speedup": round(speedup, 1),
+        "failed": failed,
+        "min_speedup": min_speedup,
+        "ok": not failed and speedup >= min_speedup,
+    }
+
+
+def make_slate(games=15, players=400, seed=0):
+    """Synthetic scoreboard and box scores for a night of `games` games.
+
+    `players` players log minutes across the slate; every team also has two
+    players who did not play. Every third game is final.
+    """
+    rnd = random.Random(seed)
+    scoreboard_data = copy.deepcopy(scoreboard.ScoreBoard.expected_data)
+    game_template = scoreboard_data["scoreboard"]["games"].pop()
+    player_template = boxscore.BoxScore.expected_data["game"]["homeTeam"]["players"][0]
+
+    box_scores = {}
+    person_id = 1000000
+    teams = games * 2
+    for g in range(games):
+        game_id = "00224{:05d}".format(g)
+        final = g % 3 == 0
+        game = copy.deepcopy(game_template)
+        game.update(
+            gameId=game_id,
+            gameStatus=3 if final else 2,
+            gameStatusText="Final" if final else "5:12",
+            period=4 if final else 3,
+        )
+        box = copy.deepcopy(boxscore.BoxScore.expected_data)
+        box["game"]["gameId"] = game_id
+        for t, team_key in enumerate(("homeTeam", "awayTeam")):
+            team_index = g * 2 + t
+            tricode = "T{:02d}".format(team_index)
+            game[team_key].update(teamTricode=tricode, score=rnd.randint(70, 130))
+            box["game"][team_key]["teamTricode"] = tricode
+            played = players // teams + (team_index < players % teams)
+            roster = []
+            for i in range(played + 2):
+                person_id += 1
+                player = copy.deepcopy(player_template)
+                player.update(personId=person_id, name="Player {}".format(person_id))
+                fga = rnd.randint(0, 25)
+                fg3a = rnd.randint(0, min(fga, 12))
+                fta = rnd.randint(0, 12)
+                player["statistics"].update(
+                    minutes=(
+                        "PT{:02d}M{:05.2f}S".format(
+                            rnd.randint(1, 44), rnd.uniform(0, 59.99)
+                        )
+                        if i < played
+                        else "PT00M00.00S"
+                    ),
+                    points=rnd.randint(0, 50),
+                    reboundsTotal=rnd.randint(0, 18),
+                    assists=rnd.randint(0, 15),
+                    steals=rnd.randint(0, 5),
+                    blocks=rnd.randint(0, 5),
+                    turnovers=rnd.randint(0, 7),
+                    fieldGoalsAttempted=fga,
+                    fieldGoalsMade=rnd.randint(0, fga),
+                    threePointersAttempted=fg3a,
+                    threePointersMade=rnd.randint(0, fg3a),
+                    freeThrowsAttempted=fta,
+                    freeThrowsMade=rnd.randint(0, fta),
+                )
+                roster.append(player)
+            box["game"][team_key]["players"] = roster
+        scoreboard_data["scoreboard"]["games"].append(game)
+        box_scores[game_id] = box
+    return scoreboard_data, box_scores
+
+
+def _legacy_rank_categories(combined_stats):
+    """Row-by-row ranking used before the vectorized stage, kept for comparison"""
+    import pandas as pd
+    from leaderboard import CATEGORIES, PERCENTAGE_ATTEMPTS, get_player_image_url
+
+    results = {}
+    for category_name, column in CATEGORIES.items():
+        if category_name == "Minutes":
+            top_players = combined_stats.nlargest(30, "MIN_SORT", keep="all")
+        elif category_name in PERCENTAGE_ATTEMPTS:
+            attempts_col = PERCENTAGE_ATTEMPTS[category_name]
+            valid_players = combined_stats[
+                (combined_stats[attempts_col] >= 3) & (combined_stats["MIN_SORT"] > 0)
+            ]
+            top_players = (
+                valid_players.nlargest(30, column, keep="all")
+                if len(valid_players) > 0
+                else pd.DataFrame()
+            )
+        else:
+            active_players = combined_stats[combined_stats["MIN_SORT"] > 0]
+            top_players = active_players.nlargest(30, column, keep="all")
+
+        results[category_name] = []
+        for _, player in top_players.iterrows():
+            if category_name == "Minutes":
+                value = player["MIN"]
+            elif category_name in PERCENTAGE_ATTEMPTS:
+                attempts_col = PERCENTAGE_ATTEMPTS[category_name]
+                made_col = attempts_col.replace("A", "M")
+                value = f"{player[column]:.1f}% ({int(player[made_col])}/{int(player[attempts_col])})"
+            else:
+                value = str(int(player[column]))
+            results[category_name].append(
+                f"{player['PLAYER_NAME']} ({player['TEAM_ABBREVIATION']}) [{player['GAME_STATUS']}]: {value} ||| {get_player_image_url(player['PLAYER_ID'])}"
+            )
+    return results
+
+
+def _legacy_player_frames(scoreboard_data, box_scores):
+    """Dict-per-player frame construction used before the columnar extractor"""
+    import pandas as pd
+    from leaderboard import COUNT_FIELDS
+
+    frames = []
+    for game in scoreboard_data["scoreboard"]["games"]:
+        players_data = []
+        for team_key in ("homeTeam", "awayTeam"):
+            for player in box_scores[game["gameId"]]["game"][team_key]["players"]:
+                statistics = player["statistics"]
+                if statistics["minutes"] != "PT00M00.00S":
+                    player_dict = {
+                        "PLAYER_NAME": player["name"],
+                        "PLAYER_ID": player["personId"],
+                        "TEAM_ABBREVIATION": game[team_key]["teamTricode"],
+                        "MIN": statistics["minutes"],
+                    }
+                    for column, key in COUNT_FIELDS.items():
+                        player_dict[column] = statistics[key]
+                    players_data.append(player_dict)
+        frames.append(pd.DataFrame(players_data))
+    return frames
+
+
+def _best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_ranking(games=15, players=400, repeat=20):
+    """Compare the legacy row-by-row ranking with the vectorized one"""
+    import pandas as pd
+    from leaderboard import build_game_frame, combine_frames, rank_categories
+
+    scoreboard_data, box_scores = make_slate(games, players)
+    frames = [
+        build_game_frame(game, box_scores[game["gameId"]])
+        for game in scoreboard_data["scoreboard"]["games"]
+    ]
+    combined_stats = combine_frames(frames)
+    legacy_stats = pd.DataFrame(combined_stats)
+
+    legacy = _best_of(lambda: _legacy_rank_categories(legacy_stats), repeat)
+    vectorized = _best_of(lambda: rank_categories(combined_stats), repeat)
+    return {
+        "players": len(legacy_stats),
+        "legacy_ms": round(legacy * 1000, 2),
+        "vectorized_ms": round(vectorized * 1000, 2),
+        "speedup": round(legacy / vectorized, 1),
+    }
+
+
+def bench_frames(games=15, players=400, repeat=20):
+    """Compare dict-per-player frame construction with the columnar extractor"""
+    from leaderboard import PLAYER_EXTRACTOR
+
+    scoreboard_data, box_scores = make_slate(games, players)
+    games_list = scoreboard_data["scoreboard"]["games"]
+
+    legacy = _best_of(
+        lambda: _legacy_player_frames(scoreboard_data, box_scores), repeat
+    )
+    columnar = _best_of(
+        lambda: [
+            PLAYER_EXTRACTOR.extract_dict(box_scores[game["gameId"]]["game"])
+            for game in games_list
+        ],
+        repeat,
+    )
+    return {
+        "games": games,
+        "legacy_ms": round(legacy * 1000, 2),
+        "columnar_ms": round(columnar * 1000, 2),
+        "speedup": round(legacy / columnar, 1),
+    }
+
+
+def bench_json(calls=5, repeat=200):
+    """Compare re-parsing on every get_dict/get_json call with parse-once.
+
+    Each round mimics an endpoint: `calls` get_dict() calls plus one
+    get_json(), over the sample payloads in BoxScore.expected_data.
+    """
+    from nba_api.library import http
+
+    body = json.dumps(boxscore.BoxScore.expected_data)
+
+    def legacy():
+        for _ in range(calls):
+            json.loads(body)
+        json.dumps(json.loads(body))
+
+    def parse_once():
+        response = http.NBAResponse(response=body, status_code=200, url=None)
+        for _ in range(calls):
+            response.get_dict()
+        response.get_json()
+
+    legacy_time = _best_of(legacy, repeat)
+    parse_once_time = _best_of(parse_once, repeat)
+    return {
+        "body_bytes": len(body),
+        "backend": "orjson" if http.orjson is not None else "json",
+        "legacy_us": round(legacy_time * 1e6, 1),
+        "parse_once_us": round(parse_once_time * 1e6, 1),
+        "speedup": round(legacy_time / parse_once_time, 1),
+    }
+
+
+def make_play_by_play(actions=600, seed=0):
+    """Synthetic live play-by-play body with `actions` shots and rebounds"""
+    rnd = random.Random(seed)
+    template = playbyplay.PlayByPlay.expected_data["game"]["actions"][0]
+    score = {"scoreHome": 0, "scoreAway": 0}
+    feed = []
+    for number in range(1, actions + 1):
+        home = rnd.random() < 0.5
+        action = dict(
+            template,
+            actionNumber=number,
+            orderNumber=number * 10000,
+            period=1 + (number - 1) * 4 // actions,
+            teamId=1610612738 if home else 1610612753,
+            personId=rnd.randint(1, 10) + (0 if home else 100),
+            playerNameI="Player",
+        )
+        if rnd.random() < 0.6:
+            made = rnd.random() < 0.45
+            three = rnd.random() < 0.35
+            if made:
+                score["scoreHome" if home else "scoreAway"] += 3 if three else 2
+            action.update(
+                actionType="3pt" if three else "2pt",
+                subType="jumpshot",
+                shotResult="Made" if made else "Missed",
+            )
+        else:
+            action.update(actionType="rebound", subType="defensive")
+        action.update({key: str(value) for key, value in score.items()})
+        feed.append(action)
+    return {"meta": {"code": 200}, "game": {"gameId": "0022400001", "actions": feed}}
+
+
+def bench_playbyplay(actions=600, new=5, repeat=50):
+    """Per-poll cost of replaying the whole feed vs the action cursor.
+
+    Each poll sees `new` more actions than the previous one. Both sides
+    parse the body; the legacy side rebuilds the running state from every
+    action, the tracker applies only the new ones.
+    """
+    from nba_api.library.http import NBAResponse
+    from nba_api.live.nba.library.tracker import GameState, PlayByPlayTracker
+
+    data = make_play_by_play(actions)
+    before = dict(data, game=dict(data["game"], actions=data["game"]["actions"][:-new]))
+    bodies = [json.dumps(before), json.dumps(data)]
+
+    def legacy():
+        state = GameState()
+        for action in NBAResponse(bodies[1], 200, None).get_dict()["game"]["actions"]:
+            state.apply(action)
+
+    def cursor():
+        tracker = PlayByPlayTracker(data["game"]["gameId"])
+        tracker.update(NBAResponse(bodies[0], 200, None))
+        start = time.perf_counter()
+        tracker.update(NBAResponse(bodies[1], 200, None))
+        return time.perf_counter() - start
+
+    unchanged = PlayByPlayTracker(data["game"]["gameId"])
+    response = NBAResponse(bodies[1], 200, None)
+    unchanged.update(response)
+
+    legacy_time = _best_of(legacy, repeat)
+    cursor_time = min(cursor() for _ in range(repeat))
+    unchanged_time = _best_of(lambda: unchanged.update(response), repeat)
+    return {
+        "actions": actions,
+        "new": new,
+        "legacy_ms": round(legacy_time * 1000, 3),
+        "cursor_ms": round(cursor_time * 1000, 3),
+        "unchanged_ms": round(unchanged_time * 1000, 4),
+        "speedup": round(legacy_time / cursor_time, 1),
+    }
+
+
+REPLAY_ARCHIVE = os.environ.get("REPLAY_ARCHIVE")
+REPLAY_SPEED = os.environ.get("REPLAY_SPEED", "max")
+# p99 of one stats handler call over a replay
+REPLAY_BUDGET_MS = float(os.environ.get("REPLAY_BUDGET_MS", 500))
+
+
+def make_night(path, games=10, players=300, polls=36, interval=10.0, actions=500):
+    """Write a synthetic game night archive of `polls` polls `interval` apart.
+
+    Game g tips off at poll g * polls // (2 * games) and is final half the
+    night later. Live box scores change on every poll and play-by-play
+    grows with the game; final games keep their last responses.
+    """
+    from nba_api.library.replay import ArchiveWriter
+
+    def url(endpoint):
+        return NBALiveHTTP.base_url.format(endpoint=endpoint)
+
+    feed = make_play_by_play(actions)
+    headers = {"Content-Type": "application/json"}
+    bodies = {}
+    with ArchiveWriter(path, started=0.0, interval=interval) as writer:
+        for poll in range(polls):
+            t = poll * interval
+            scoreboard_data, box_scores = make_slate(games, players, seed=poll)
+            responses = []
+            for g, game in enumerate(scoreboard_data["scoreboard"]["games"]):
+                game_id = game["gameId"]
+                start = g * polls // (2 * games)
+                end = start + polls // 2
+                status = 1 if poll < start else 2 if poll < end else 3
+                game.update(
+                    gameStatus=status,
+                    gameStatusText=("7:00 pm ET", "Q3 5:12", "Final")[status - 1],
+                    period=(0, 3, 4)[status - 1],
+                )
+                if status == 1:
+                    continue
+                if status == 3 and game_id in bodies:
+                    responses.extend(bodies[game_id])
+                    continue
+                box = box_scores[game_id]
+                box["game"]["gameStatus"] = status
+                played = min(actions, actions * (poll - start + 1) // (end - start))
+                pbp = {
+                    "meta": feed["meta"],
+                    "game": {
+                        "gameId": game_id,
+                        "actions": feed["game"]["actions"][:played],
+                    },
+                }
+                bodies[game_id] = [
+                    (boxscore.BoxScore.endpoint_url.format(game_id=game_id), box),
+                    (playbyplay.PlayByPlay.endpoint_url.format(game_id=game_id), pbp),
+                ]
+                responses.extend(bodies[game_id])
+            responses.insert(0, (scoreboard.ScoreBoard.endpoint_url, scoreboard_data))
+            for endpoint, data in responses:
+                writer.write(
+                    t,
+                    url(endpoint),
+                    200,
+                    url(endpoint),
+                    json.dumps(data),
+                    headers,
+                    0.05,
+                )
+
+
+def _percentiles(samples):
+    """Nearest-rank p50/p90/p99/max of `samples` seconds, in milliseconds"""
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    result = {}
+    for name, q in (("p50", 50), ("p90", 90), ("p99", 99)):
+        index = max(0, -(-q * len(ordered) // 100) - 1)
+        result[name] = round(ordered[index] * 1000, 2)
+    result["max"] = round(ordered[-1] * 1000, 2)
+    return result
+
+
+def _endpoint_name(key):
+    """`boxscore` for .../boxscore/boxscore_0022400001.json"""
+    name = key.split("?", 1)[0].rsplit("/", 1)[-1]
+    return re.sub(r"(_\w+)?\.json$", "", name)
+
+
+def _replay_pass(replayer, interval):
+    """Poll the stats handler and a play-by-play tracker per game over a replay"""
+    import stats
+    from leaderboard import IncrementalLeaderboard
+    from nba_api.live.nba.library.tracker import PlayByPlayTracker
+
+    stats.leaderboard = IncrementalLeaderboard()
+    NBALiveHTTP.clear_validators()
+    replayer.rewind()
+    timings = {"stats": [], "playbyplay": []}
+    trackers = {}
+    errors = 0
+    while True:
+        start = time.perf_counter()
+        result = stats.get_todays_stats()
+        timings["stats"].append(time.perf_counter() - start)
+        errors += "error" in result
+        for game in result["games"]:
+            if game["gameStatus"] < 2:
+                continue
+            tracker = trackers.setdefault(
+                game["gameId"], PlayByPlayTracker(game["gameId"])
+            )
+            start = time.perf_counter()
+            try:
+                tracker.update()
+            except Exception:
+                errors += 1
+            timings["playbyplay"].append(time.perf_counter() - start)
+        if replayer.finished:
+            return timings, errors
+        if replayer.speed is None:
+            replayer.advance(interval)
+        else:
+            time.sleep(interval / replayer.speed)
+
+
+def bench_replay(
+    archive=REPLAY_ARCHIVE, speed=REPLAY_SPEED, budget_ms=REPLAY_BUDGET_MS
+):
+    """Latency, memory and upstream calls of a game night replayed offline.
+
+    Every poll runs get_todays_stats and then updates a play-by-play tracker
+    for each game that has tipped off. The live response cache is bypassed
+    since its TTLs follow the wall clock, not the replay. Peak memory comes
+    from a second pass under tracemalloc, so it does not skew the timings.
+    Fails when the stats handler's p99 exceeds `budget_ms` (env
+    REPLAY_BUDGET_MS) or when any poll errors.
+    """
+    import logging
+
+    from nba_api.library.replay import Replayer
+
+    speed = None if speed in (None, "max") else float(speed)
+    synthetic = archive is None
+    with tempfile.TemporaryDirectory() as directory:
+        if synthetic:
+            archive = os.path.join(directory, "night.jsonl.gz")
+            make_night(archive)
+        replayer = Replayer(archive, speed=speed)
+        archive_bytes = os.path.getsize(archive)
+    interval = replayer.header.get("interval", 10)
+
+    logging.disable(logging.INFO)
+    cache = NBALiveHTTP.cache
+    NBALiveHTTP.cache = None
+    try:
+        with replayer:
+            timings, errors = _replay_pass(replayer, interval)
+            calls = dict(replayer.calls)
+            not_modified = replayer.not_modified
+            tracemalloc.start()
+            _replay_pass(replayer, interval)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    finally:
+        NBALiveHTTP.cache = cache
+        logging.disable(logging.NOTSET)
+
+    by_endpoint = {}
+    for key, count in calls.items():
+        name = _endpoint_name(key)
+        by_endpoint[name] = by_endpoint.get(name, 0) + count
+    polls = len(timings["stats"])
+    latency = {name: _percentiles(samples) for name, samples in timings.items()}
+    return {
+        "archive": "synthetic" if synthetic else archive,
+        "archive_kb": round(archive_bytes / 1024, 1),
+        "speed": speed or "max",
+        "polls": polls,
+        "latency_ms": latency,
+        "peak_memory_mb": round(peak / 2**20, 2),
+        "upstream_calls": sum(calls.values()),
+        "upstream_calls_per_poll": round(sum(calls.values()) / polls, 1),
+        "upstream_by_endpoint": by_endpoint,
+        "not_modified": not_modified,
+        "errors": errors,
+        "budget_ms": budget_ms,
+        "ok": errors == 0 and latency["stats"]["p99"] <= budget_ms,
+    }
+
+
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", 800))
+
+# Modules the stats entry point must leave for first use
+DEFERRED_MODULES = ("pandas", "nba_api.stats.endpoints", "nba_api.stats.library.data")
+
+
+def _import_times(module):
+    """Cumulative import time in microseconds per module, from -X importtime"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [here, env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        cwd=here,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            times[parts[2].strip()] = int(parts[1])
+    return times
+
+
+def bench_import(module="stats", repeat=5, budget_ms=IMPORT_BUDGET_MS):
+    """Cold-start import of the stats entry point in fresh interpreters.
+
+    Fails when the best of `repeat` imports exceeds `budget_ms` (env
+    IMPORT_BUDGET_MS) or when one of DEFERRED_MODULES is imported eagerly.
+    """
+    timings = []
+    for _ in range(repeat):
+        times = _import_times(module)
+        timings.append(times[module] / 1000)
+    best = min(timings)
+    deferred = [name for name in DEFERRED_MODULES if name in times]
+    return {
+        "module": module,
+        "import_ms": round(best, 1),
+        "budget_ms": budget_ms,
+        "eager_deferred_modules": deferred,
+        "ok": best <= budget_ms and not deferred,
+    }
+
+
+BENCHMARKS = {
+    "fanout": bench_box_score_fanout,
+    "ranking": bench_ranking,
+    "frames": bench_frames,
+    "json": bench_json,
+    "playbyplay": bench_playbyplay,
+    "replay": bench_replay,
+    "import": bench_import,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    failed = []
+    for name in names:
+        result = BENCHMARKS[name]()
+        print(name, json.dumps(result))
+        if result.get("ok") is False:
+            failed.append(name)
+    if failed:
+        sys.exit("Benchmarks over budget: " + ", ".join(failed))
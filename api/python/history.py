@@ -0,0 +1,465 @@
+"""Local columnar store of player game logs, backfilled from LeagueGameFinder.
+
+Every season is a directory of raw column files that are appended in place
+and read back as memory-mapped NumPy arrays. `meta.json` records how many
+rows are committed, so a crash mid-append leaves the season readable.
+
+Usage:
+    python3 api/python/history.py backfill 2023-24 [2022-23 ...]
+    python3 api/python/history.py update
+    python3 api/python/history.py player PLAYER_ID [--season 2023-24]
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+import vendor_path  # noqa: F401  (nba_api from vendor/nba_api)
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DIR = os.environ.get("NBA_HISTORY_DIR") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".history"
+)
+# Seconds between requests to stats.nba.com during a backfill
+HISTORY_REQUEST_DELAY = float(os.environ.get("NBA_HISTORY_REQUEST_DELAY", 1.0))
+HISTORY_TIMEOUT = float(os.environ.get("NBA_HISTORY_TIMEOUT", 60))
+
+# Seasons are named like "2023-24"; the name is also the season's directory
+SEASON_PATTERN = r"^[0-9]{4}-[0-9]{2}$"
+
+# LeagueGameFinder returns at most this many rows per request
+ROW_LIMIT = 30000
+
+SEASON_TYPES = ("Regular Season", "PlayIn", "Playoffs")
+# First digit of SEASON_ID for each season type
+SEASON_TYPE_PREFIX = {
+    "Pre Season": b"1",
+    "Regular Season": b"2",
+    "All Star": b"3",
+    "Playoffs": b"4",
+    "PlayIn": b"5",
+}
+
+KEY_COLUMNS = [
+    ("SEASON_ID", "S5"),
+    ("PLAYER_ID", "i8"),
+    ("TEAM_ID", "i8"),
+    ("TEAM_ABBREVIATION", "S4"),
+    ("GAME_ID", "S10"),
+    ("GAME_DATE", "datetime64[D]"),
+    ("MATCHUP", "S12"),
+    ("WL", "S1"),
+]
+# Missing values (e.g. three-pointers before 1979-80) are stored as NaN
+STAT_COLUMNS = [
+    "MIN",
+    "PTS",
+    "FGM",
+    "FGA",
+    "FG_PCT",
+    "FG3M",
+    "FG3A",
+    "FG3_PCT",
+    "FTM",
+    "FTA",
+    "FT_PCT",
+    "OREB",
+    "DREB",
+    "REB",
+    "AST",
+    "STL",
+    "BLK",
+    "TOV",
+    "PF",
+    "PLUS_MINUS",
+]
+COLUMNS = KEY_COLUMNS + [(name, "f4") for name in STAT_COLUMNS]
+
+# Percentages are recomputed from made/attempted totals, not averaged
+PERCENTAGES = {
+    "FG_PCT": ("FGM", "FGA"),
+    "FG3_PCT": ("FG3M", "FG3A"),
+    "FT_PCT": ("FTM", "FTA"),
+}
+COUNTING_COLUMNS = [name for name in STAT_COLUMNS if name not in PERCENTAGES]
+
+# Live box score / play-by-play column names that differ from the store
+COLUMN_ALIASES = {"TO": "TOV"}
+
+
+def season_for(day):
+    """Season string (e.g. "2023-24") that a calendar day belongs to"""
+    year = day.year if day.month > 9 else day.year - 1
+    return "{}-{}".format(year, str(year + 1)[2:])
+
+
+def season_dates(season):
+    """First and last day to search for games of a season"""
+    year = int(season[:4])
+    return date(year, 9, 1), date(year + 1, 8, 31)
+
+
+def rows_to_columns(headers, rows):
+    """Convert LeagueGameFinder rows to arrays in the COLUMNS layout"""
+    index = {name: i for i, name in enumerate(headers)}
+    columns = {}
+    for name, dtype in COLUMNS:
+        i = index[name]
+        values = [row[i] for row in rows]
+        if name == "GAME_DATE":
+            values = [value[:10] for value in values]
+        elif dtype.startswith("S"):
+            values = [str(value or "").encode("ascii", "replace") for value in values]
+        columns[name] = np.array(values, dtype=dtype)
+    return columns
+
+
+def fetch_game_logs(season, season_type, date_from=None, date_to=None):
+    """One LeagueGameFinder request for player game logs.
+
+    Returns (headers, rows). Dates are inclusive `datetime.date`s.
+    """
+    from nba_api.stats.endpoints import LeagueGameFinder
+
+    finder = LeagueGameFinder(
+        player_or_team_abbreviation="P",
+        league_id_nullable="00",
+        season_nullable=season,
+        season_type_nullable=season_type,
+        date_from_nullable=date_from.strftime("%m/%d/%Y") if date_from else "",
+        date_to_nullable=date_to.strftime("%m/%d/%Y") if date_to else "",
+        timeout=HISTORY_TIMEOUT,
+    )
+    data = finder.league_game_finder_results.get_dict()
+    return data["headers"], data["data"]
+
+
+def page_game_logs(
+    season, season_type, date_from=None, date_to=None, fetch=fetch_game_logs
+):
+    """Yield (headers, rows) pages covering a season type.
+
+    A request that hits ROW_LIMIT may have been truncated, so its date
+    range is split in two and fetched again.
+    """
+    headers, rows = fetch(season, season_type, date_from, date_to)
+    if len(rows) < ROW_LIMIT:
+        yield headers, rows
+        return
+
+    if date_from is None or date_to is None:
+        first, last = season_dates(season)
+        date_from, date_to = date_from or first, date_to or last
+    if date_from >= date_to:
+        logger.warning(f"{season} {season_type} {date_from}: row limit reached")
+        yield headers, rows
+        return
+
+    middle = date_from + (date_to - date_from) // 2
+    for start, end in ((date_from, middle), (middle + timedelta(days=1), date_to)):
+        time.sleep(HISTORY_REQUEST_DELAY)
+        yield from page_game_logs(season, season_type, start, end, fetch)
+
+
+class HistoryStore:
+    """Season-partitioned player game logs on local disk.
+
+    Reads only touch memory-mapped column files, so queries make no
+    upstream calls. A single process should write to a store at a time.
+    """
+
+    def __init__(self, directory=HISTORY_DIR, fetch=fetch_game_logs):
+        self.directory = directory
+        self.fetch = fetch
+        self._seasons = {}
+        self._names = None
+
+    # Storage
+
+    def _season_dir(self, season):
+        if not isinstance(season, str) or not re.fullmatch(SEASON_PATTERN, season):
+            raise ValueError(f"Invalid season {season!r}, expected e.g. 2023-24")
+        return os.path.join(self.directory, season)
+
+    def _read_meta(self, season):
+        try:
+            with open(os.path.join(self._season_dir(season), "meta.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"rows": 0, "last_game_date": None}
+
+    def _write_json(self, path, data):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def seasons(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            name
+            for name in os.listdir(self.directory)
+            if re.fullmatch(SEASON_PATTERN, name)
+            and os.path.isfile(os.path.join(self.directory, name, "meta.json"))
+        )
+
+    def season(self, season):
+        """Memory-mapped columns of one season, as {name: array}"""
+        meta = self._read_meta(season)
+        cached = self._seasons.get(season)
+        if cached is not None and cached[0] == meta["rows"]:
+            return cached[1]
+
+        rows = meta["rows"]
+        columns = {}
+        for name, dtype in COLUMNS:
+            path = os.path.join(self._season_dir(season), name + ".bin")
+            if rows:
+                columns[name] = np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+            else:
+                columns[name] = np.empty(0, dtype=dtype)
+        self._seasons[season] = (rows, columns)
+        return columns
+
+    def last_game_date(self, season):
+        return self._read_meta(season)["last_game_date"]
+
+    def append(self, season, columns, names=None):
+        """Append game log rows to a season; returns how many were new.
+
+        Rows whose (GAME_ID, PLAYER_ID) is already stored are skipped, so
+        overlapping daily updates are safe to re-run.
+        """
+        count = len(columns["GAME_ID"])
+        if names:
+            self._update_names(names)
+        if not count:
+            return 0
+
+        existing = self.season(season)
+        seen = set(zip(existing["GAME_ID"].tolist(), existing["PLAYER_ID"].tolist()))
+        keep = np.zeros(count, dtype=bool)
+        # Pages can overlap each other as well as the stored rows
+        keys = zip(columns["GAME_ID"].tolist(), columns["PLAYER_ID"].tolist())
+        for i, key in enumerate(keys):
+            if key not in seen:
+                seen.add(key)
+                keep[i] = True
+        added = int(keep.sum())
+        if not added:
+            return 0
+
+        directory = self._season_dir(season)
+        os.makedirs(directory, exist_ok=True)
+        meta = self._read_meta(season)
+        rows = meta["rows"]
+        for name, dtype in COLUMNS:
+            path = os.path.join(directory, name + ".bin")
+            values = np.ascontiguousarray(columns[name][keep], dtype=dtype)
+            with open(path, "ab") as f:
+                # Drop anything past the committed rows from an interrupted append
+                f.truncate(rows * values.dtype.itemsize)
+                f.write(values.tobytes())
+
+        dates = [meta["last_game_date"], str(columns["GAME_DATE"][keep].max())]
+        meta = {
+            "rows": rows + added,
+            "last_game_date": max(d for d in dates if d),
+            "updated": time.time(),
+        }
+        self._write_json(os.path.join(directory, "meta.json"), meta)
+        self._seasons.pop(season, None)
+        return added
+
+    def _update_names(self, names):
+        merged = dict(self.player_names())
+        merged.update({str(player_id): name for player_id, name in names.items()})
+        os.makedirs(self.directory, exist_ok=True)
+        self._write_json(os.path.join(self.directory, "players.json"), merged)
+        self._names = merged
+
+    def player_names(self):
+        if self._names is None:
+            try:
+                with open(os.path.join(self.directory, "players.json")) as f:
+                    self._names = json.load(f)
+            except (OSError, ValueError):
+                self._names = {}
+        return self._names
+
+    # Upstream
+
+    def backfill(self, season, season_types=SEASON_TYPES, date_from=None):
+        """Page a season's game logs into the store; returns rows added"""
+        added = 0
+        for i, season_type in enumerate(season_types):
+            if i:
+                time.sleep(HISTORY_REQUEST_DELAY)
+            pages = page_game_logs(season, season_type, date_from, fetch=self.fetch)
+            for headers, rows in pages:
+                if not rows:
+                    continue
+                id_index = headers.index("PLAYER_ID")
+                name_index = headers.index("PLAYER_NAME")
+                names = {row[id_index]: row[name_index] for row in rows}
+                added += self.append(season, rows_to_columns(headers, rows), names)
+            logger.info(f"Backfilled {season} {season_type}: {added} rows so far")
+        return added
+
+    def update(self, today=None):
+        """Daily append: fetch the current season since its last stored game"""
+        today = today or date.today()
+        season = season_for(today)
+        last = self.last_game_date(season)
+        date_from = date.fromisoformat(last) if last else None
+        return season, self.backfill(season, date_from=date_from)
+
+    # Queries
+
+    def _player_rows(self, player_id, seasons, season_types):
+        prefixes = [SEASON_TYPE_PREFIX[season_type] for season_type in season_types]
+        for season in seasons:
+            columns = self.season(season)
+            mask = columns["PLAYER_ID"] == player_id
+            if not mask.any():
+                continue
+            season_ids = columns["SEASON_ID"][mask]
+            type_mask = np.zeros(len(season_ids), dtype=bool)
+            for prefix in prefixes:
+                type_mask |= np.char.startswith(season_ids, prefix)
+            rows = np.flatnonzero(mask)[type_mask]
+            if len(rows):
+                yield season, columns, rows
+
+    def player_games(self, player_id, seasons=None, season_types=("Regular Season",)):
+        """One player's game logs as {name: array}, oldest first"""
+        parts = list(
+            self._player_rows(player_id, seasons or self.seasons(), season_types)
+        )
+        games = {
+            name: (
+                np.concatenate([columns[name][rows] for _, columns, rows in parts])
+                if parts
+                else np.empty(0, dtype=dtype)
+            )
+            for name, dtype in COLUMNS
+        }
+        order = np.argsort(games["GAME_DATE"], kind="stable")
+        return {name: values[order] for name, values in games.items()}
+
+    def season_average(self, player_id, season=None, season_types=("Regular Season",)):
+        """Per-game averages for one season; percentages come from totals"""
+        season = season or season_for(date.today())
+        games = self.player_games(player_id, [season], season_types)
+        played = len(games["GAME_ID"])
+        averages = {"GAMES": played}
+        for name in COUNTING_COLUMNS:
+            values = games[name]
+            averages[name] = (
+                round(float(np.nanmean(values)), 2)
+                if played and not np.isnan(values).all()
+                else None
+            )
+        for name, (made, attempts) in PERCENTAGES.items():
+            total = np.nansum(games[attempts])
+            averages[name] = (
+                round(float(np.nansum(games[made]) / total), 3) if total else None
+            )
+        return averages
+
+    def career_highs(self, player_id, columns=None, season_types=("Regular Season",)):
+        """Best single game for each column, with the game it came from"""
+        games = self.player_games(player_id, season_types=season_types)
+        highs = {}
+        for name in columns or COUNTING_COLUMNS:
+            values = games[name]
+            if not len(values) or np.isnan(values).all():
+                highs[name] = None
+                continue
+            # First game that reached the high
+            best = int(np.nanargmax(values))
+            highs[name] = {
+                "value": float(values[best]),
+                "GAME_ID": games["GAME_ID"][best].decode(),
+                "GAME_DATE": str(games["GAME_DATE"][best]),
+                "MATCHUP": games["MATCHUP"][best].decode(),
+            }
+        return highs
+
+    def compare(self, player_id, line, season=None, season_types=("Regular Season",)):
+        """Compare a stat line from today with the season average and career highs.
+
+        `line` maps column names (box score names such as TO are accepted)
+        to today's values.
+        """
+        line = {COLUMN_ALIASES.get(name, name): value for name, value in line.items()}
+        names = [name for name in COUNTING_COLUMNS if name in line]
+        averages = self.season_average(player_id, season, season_types)
+        highs = self.career_highs(player_id, names, season_types)
+        comparison = {}
+        for name in names:
+            today = float(line[name])
+            average = averages[name]
+            high = highs[name]["value"] if highs[name] else None
+            comparison[name] = {
+                "today": today,
+                "season_average": average,
+                "vs_average": (
+                    round(today - average, 2) if average is not None else None
+                ),
+                "career_high": high,
+                "new_career_high": high is None or today > high,
+            }
+        return {"games": averages["GAMES"], "stats": comparison}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--dir", default=HISTORY_DIR, help="store directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser("backfill", help="page whole seasons into the store")
+    backfill.add_argument("seasons", nargs="+", help='e.g. "2023-24"')
+    backfill.add_argument(
+        "--season-type", action="append", choices=sorted(SEASON_TYPE_PREFIX)
+    )
+
+    commands.add_parser("update", help="append the current season's new games")
+
+    player = commands.add_parser("player", help="season averages and career highs")
+    player.add_argument("player_id", type=int)
+    player.add_argument("--season")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    store = HistoryStore(args.dir)
+
+    if args.command == "backfill":
+        for season in args.seasons:
+            added = store.backfill(season, args.season_type or SEASON_TYPES)
+            print(json.dumps({"season": season, "added": added}))
+    elif args.command == "update":
+        season, added = store.update()
+        print(json.dumps({"season": season, "added": added}))
+    elif args.command == "player":
+        print(
+            json.dumps(
+                {
+                    "season_average": store.season_average(args.player_id, args.season),
+                    "career_highs": store.career_highs(args.player_id),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
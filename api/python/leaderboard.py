@@ -0,0 +1,309 @@
+import hashlib
+import logging
+import re
+import threading
+
+import numpy as np
+from nba_api.library.columnar import ColumnarExtractor
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = {
+    "Points": "PTS",
+    "Rebounds": "REB",
+    "Assists": "AST",
+    "Steals": "STL",
+    "Blocks": "BLK",
+    "Minutes": "MIN",
+    "Turnovers": "TO",
+    "Field Goal %": "FG_PCT",
+    "3-Point %": "FG3_PCT",
+    "Free Throw %": "FT_PCT",
+}
+
+PERCENTAGE_ATTEMPTS = {
+    "Field Goal %": "FGA",
+    "3-Point %": "FG3A",
+    "Free Throw %": "FTA",
+}
+
+
+PLAYER_IMAGE_URL = "https://cdn.nba.com/headshots/nba/latest/1040x760/{}.png"
+
+
+def get_player_image_url(player_id):
+    return PLAYER_IMAGE_URL.format(player_id)
+
+
+# Live box scores report minutes as ISO durations, e.g. PT34M51.02S. The
+# second alternative matches a malformed line so every line yields one match.
+ISO_DURATION_PATTERN = re.compile(
+    r"^(?:PT(\d+(?:\.\d+)?)M(\d+(?:\.\d+)?)S|.*)$", re.MULTILINE
+)
+
+TOP_N = 30
+
+
+def parse_iso_durations(durations):
+    """Parse a list of ISO durations in one regex pass.
+
+    Returns the played minutes as floats (for sorting) and the MM:SS labels.
+    Missing or malformed durations count as zero minutes.
+    """
+    text = "\n".join(
+        d if isinstance(d, str) and "\n" not in d else "" for d in durations
+    )
+    parts = np.array(ISO_DURATION_PATTERN.findall(text), dtype=str).reshape(-1, 2)
+    parts[parts == ""] = "0"
+    minutes, seconds = parts.astype(float).T
+    labels = (
+        minutes.astype(int).astype(str).astype(object)
+        + ":"
+        + np.char.zfill(seconds.astype(int).astype(str), 2).astype(object)
+    )
+    return minutes + seconds / 60, labels
+
+
+def get_game_status(game):
+    """Status label shown next to each player, from the scoreboard game"""
+    if game["gameStatus"] == 3:
+        return "Final"
+    return f"Q{game['period']} {game['gameStatusText']}"
+
+
+def _played(player):
+    return player["statistics"]["minutes"] != "PT00M00.00S"
+
+
+# Counting stats read from each live box score player, as int64 columns
+COUNT_FIELDS = {
+    "PTS": "points",
+    "REB": "reboundsTotal",
+    "AST": "assists",
+    "STL": "steals",
+    "BLK": "blocks",
+    "TO": "turnovers",
+    "FGM": "fieldGoalsMade",
+    "FGA": "fieldGoalsAttempted",
+    "FG3M": "threePointersMade",
+    "FG3A": "threePointersAttempted",
+    "FTM": "freeThrowsMade",
+    "FTA": "freeThrowsAttempted",
+}
+
+PLAYER_EXTRACTOR = ColumnarExtractor(
+    fields=[
+        ("PLAYER_NAME", ("name",)),
+        ("PLAYER_ID", ("personId",)),
+        ("MIN", ("statistics", "minutes")),
+    ]
+    + [(column, ("statistics", key)) for column, key in COUNT_FIELDS.items()],
+    team_fields=[("TEAM_ABBREVIATION", "teamTricode")],
+    player_filter=_played,
+    dtypes={
+        "PLAYER_NAME": object,
+        "PLAYER_ID": np.int64,
+        "TEAM_ABBREVIATION": object,
+        **{column: np.int64 for column in COUNT_FIELDS},
+    },
+)
+
+
+def _percentage(made, attempts):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.round(made / attempts * 100, 1)
+    return np.where(attempts > 0, pct, 0.0)
+
+
+def build_game_frame(game, box_data):
+    """Build the processed player columns for one game, or None if nobody played.
+
+    A frame is a dict of equal-length NumPy arrays keyed by column name.
+    """
+    columns = PLAYER_EXTRACTOR.extract_dict(box_data["game"])
+    if not len(columns["PLAYER_ID"]):
+        return None
+
+    columns["GAME_STATUS"] = np.full(
+        len(columns["PLAYER_ID"]), get_game_status(game), dtype=object
+    )
+    columns["FG_PCT"] = _percentage(columns["FGM"], columns["FGA"])
+    columns["FG3_PCT"] = _percentage(columns["FG3M"], columns["FG3A"])
+    columns["FT_PCT"] = _percentage(columns["FTM"], columns["FTA"])
+    columns["MIN_SORT"], columns["MIN"] = parse_iso_durations(columns["MIN"])
+    return columns
+
+
+def combine_frames(frames):
+    """Concatenate game frames column by column"""
+    return {column: np.concatenate([f[column] for f in frames]) for column in frames[0]}
+
+
+def top_positions(values, top_n=TOP_N):
+    """Row positions of the top_n values in every column, ties included.
+
+    `values` is a 2-D array with one column per category and -inf for rows
+    that are not eligible. Each column is ordered by descending value with
+    ties kept in row order, matching DataFrame.nlargest(keep="all").
+    """
+    if not len(values):
+        return [np.empty(0, dtype=int) for _ in range(values.shape[1])]
+
+    order = np.argsort(-values, axis=0, kind="stable")
+    ranked = np.take_along_axis(values, order, axis=0)
+    cutoff = ranked[min(top_n, len(values)) - 1]
+
+    positions = []
+    for i in range(values.shape[1]):
+        keep = (ranked[:, i] >= cutoff[i]) & np.isfinite(ranked[:, i])
+        positions.append(order[keep, i])
+    return positions
+
+
+def rank_categories(combined_stats):
+    """Build the top-30 list of formatted player strings for every category"""
+    minutes = combined_stats["MIN_SORT"]
+    played = minutes > 0
+
+    columns = []
+    for category_name, column in CATEGORIES.items():
+        if category_name == "Minutes":
+            values, eligible = minutes, np.ones(len(minutes), dtype=bool)
+        elif category_name in PERCENTAGE_ATTEMPTS:
+            attempts_col = PERCENTAGE_ATTEMPTS[category_name]
+            values = combined_stats[column].astype(float)
+            eligible = (combined_stats[attempts_col] >= 3) & played
+        else:
+            values = combined_stats[column].astype(float)
+            eligible = played
+        columns.append(np.where(eligible, values, -np.inf))
+
+    positions = top_positions(np.column_stack(columns))
+
+    # Everything but the stat value is shared by all categories
+    prefixes = (
+        combined_stats["PLAYER_NAME"].astype(str).astype(object)
+        + " ("
+        + combined_stats["TEAM_ABBREVIATION"].astype(str).astype(object)
+        + ") ["
+        + combined_stats["GAME_STATUS"].astype(str).astype(object)
+        + "]: "
+    )
+    url_head, url_tail = PLAYER_IMAGE_URL.split("{}")
+    suffixes = (
+        " ||| "
+        + url_head
+        + combined_stats["PLAYER_ID"].astype(str).astype(object)
+        + url_tail
+    )
+
+    results = {}
+    for (category_name, column), rows in zip(CATEGORIES.items(), positions):
+        try:
+            if category_name == "Minutes":
+                values = combined_stats["MIN"][rows]
+            elif category_name in PERCENTAGE_ATTEMPTS:
+                attempts_col = PERCENTAGE_ATTEMPTS[category_name]
+                made_col = attempts_col.replace("A", "M")
+                values = [
+                    f"{pct:.1f}% ({made}/{attempts})"
+                    for pct, made, attempts in zip(
+                        combined_stats[column][rows],
+                        combined_stats[made_col][rows],
+                        combined_stats[attempts_col][rows],
+                    )
+                ]
+            else:
+                values = combined_stats[column][rows].astype(str)
+
+            results[category_name] = list(
+                prefixes[rows] + np.asarray(values, dtype=object) + suffixes[rows]
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                for player_info in results[category_name]:
+                    logger.debug(f"{category_name}: {player_info}")
+        except Exception as e:
+            logger.error(
+                f"Error processing {category_name} category: {e}", exc_info=True
+            )
+            continue
+
+    logger.info(f"Ranked {len(minutes)} players in {len(results)} categories")
+    return results
+
+
+def box_score_fingerprint(game, response):
+    """Identify a box score version from its raw body and scoreboard status"""
+    digest = hashlib.md5(response.get_bytes()).hexdigest()
+    return (digest, get_game_status(game))
+
+
+class IncrementalLeaderboard:
+    """Keeps processed player rows per game and re-ranks only on change.
+
+    Games whose box score fingerprint is unchanged since the last poll reuse
+    their stored columns, and the category lists are reused outright when no
+    game changed at all.
+    """
+
+    def __init__(self):
+        self._games = {}
+        self._results = None
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def update_game(self, game, response):
+        """Store the frame for one game; returns True if it was rebuilt"""
+        game_id = game["gameId"]
+        fingerprint = box_score_fingerprint(game, response)
+        with self._lock:
+            stored = self._games.get(game_id)
+            if stored is not None and stored[0] == fingerprint:
+                return False
+
+        with metrics.span("frame"):
+            frame = build_game_frame(game, response.get_dict())
+        with self._lock:
+            self._games[game_id] = (fingerprint, frame)
+            self._results = None
+            self._version += 1
+        return True
+
+    def retain(self, game_ids):
+        """Drop stored games that are no longer on the scoreboard"""
+        game_ids = set(game_ids)
+        with self._lock:
+            for game_id in list(self._games):
+                if game_id not in game_ids:
+                    del self._games[game_id]
+                    self._results = None
+                    self._version += 1
+
+    def has_stats(self):
+        with self._lock:
+            return any(frame is not None for _, frame in self._games.values())
+
+    def rankings(self):
+        with self._lock:
+            if self._results is not None:
+                return self._results
+            version = self._version
+            frames = [frame for _, frame in self._games.values() if frame is not None]
+
+        if not frames:
+            return {}
+
+        with metrics.span("combine"):
+            combined_stats = combine_frames(frames)
+        logger.debug(
+            f"Combined stats shape: "
+            f"({len(combined_stats['PLAYER_ID'])}, {len(combined_stats)})"
+        )
+        with metrics.span("rank"):
+            results = rank_categories(combined_stats)
+        with self._lock:
+            if self._version == version:
+                self._results = results
+        return results
@@ -0,0 +1,91 @@
+"""Record a live game night to a replay archive for offline benchmarks.
+
+Polls the scoreboard, then the box score and play-by-play of every game
+that has tipped off, until all of the night's games are final. Replay the
+archive with `python3 api/python/benchmarks.py replay`.
+
+Usage:
+    python3 api/python/recording.py night.jsonl.gz [--interval 10] [--hours 8]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import vendor_path  # noqa: F401  (nba_api from vendor/nba_api)
+from nba_api.library.replay import Recorder
+from nba_api.live.nba.endpoints import boxscore, playbyplay, scoreboard
+from nba_api.live.nba.library.http import NBALiveHTTP
+
+logger = logging.getLogger(__name__)
+
+# Seconds between polls, matching the stats stream
+RECORD_INTERVAL = 10
+# Give up after this many hours even if a game never goes final
+RECORD_HOURS = 8
+RECORD_MAX_WORKERS = 16
+
+
+def fetch_game(game_id):
+    """Fetch one game's box score and play-by-play, logging failures"""
+    for endpoint in (boxscore.BoxScore, playbyplay.PlayByPlay):
+        try:
+            endpoint(game_id)
+        except Exception as e:
+            logger.warning(f"{endpoint.__name__} failed for game {game_id}: {e}")
+
+
+def record_night(path, interval=RECORD_INTERVAL, hours=RECORD_HOURS):
+    """Record every poll of the night to `path`; returns the number of responses.
+
+    The live response cache is bypassed so every poll reaches the CDN. A
+    game is fetched once more on the poll that first sees it final, then
+    no longer.
+    """
+    deadline = time.time() + hours * 3600
+    final = set()
+    cache = NBALiveHTTP.cache
+    NBALiveHTTP.cache = None
+    try:
+        with Recorder(path, interval=interval) as recorder:
+            while True:
+                games = scoreboard.ScoreBoard().get_dict()["scoreboard"]["games"]
+                started = [
+                    game["gameId"]
+                    for game in games
+                    if game["gameStatus"] >= 2 and game["gameId"] not in final
+                ]
+                if started:
+                    workers = min(RECORD_MAX_WORKERS, len(started))
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        list(executor.map(fetch_game, started))
+                final.update(
+                    game["gameId"] for game in games if game["gameStatus"] == 3
+                )
+                logger.info(
+                    f"Recorded {recorder.count} responses; "
+                    f"{len(final)}/{len(games)} games final"
+                )
+                if len(final) == len(games) or time.time() >= deadline:
+                    return recorder.count
+                time.sleep(interval)
+    finally:
+        NBALiveHTTP.cache = cache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("path", help="archive to write, e.g. night.jsonl.gz")
+    parser.add_argument("--interval", type=float, default=RECORD_INTERVAL)
+    parser.add_argument("--hours", type=float, default=RECORD_HOURS)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    count = record_night(args.path, args.interval, args.hours)
+    print(json.dumps({"path": args.path, "responses": count}))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,26 @@
-from nba_api.stats.endpoints import LeagueGameFinder
+import os
+import sys
+
+# Sibling modules must import when this file is loaded by path, as on Vercel
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import vendor_path  # noqa: F401,E402  (nba_api from vendor/nba_api)
+from nba_api.library import http
 from nba_api.live.nba.endpoints import scoreboard, boxscore
-import pandas as pd
-import numpy as np
-from fastapi import FastAPI, Request
+from nba_api.live.nba.library.cache import live_cache
+from nba_api.live.nba.library.http import NBALiveHTTP
+from leaderboard import IncrementalLeaderboard
+import metrics
+from history import SEASON_PATTERN, HistoryStore
+from stream import StatsStream
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import json
-import sys
 import traceback
 import logging
+import math
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 import time
 
@@ -22,14 +35,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Configure logging
+# Configure logging; per-game and per-player lines are logged at DEBUG
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.environ.get("STATS_LOG_LEVEL", "INFO").upper(),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=[logging.StreamHandler(sys.stderr)],
 )
 logger = logging.getLogger(__name__)
 
+# Box score fan-out settings
+BOXSCORE_MAX_WORKERS = int(os.environ.get("BOXSCORE_MAX_WORKERS", 16))
+BOXSCORE_TIMEOUT = float(os.environ.get("BOXSCORE_TIMEOUT", 10))
+SCOREBOARD_TIMEOUT = float(os.environ.get("SCOREBOARD_TIMEOUT", 30))
+
 
 def log_error(error_msg, error=None):
     """Log error with traceback if available"""
@@ -42,48 +60,86 @@ def log_error(error_msg, error=None):
         print(f"Exception: {str(error)}\n{traceback.format_exc()}", file=sys.stderr)
 
 
-def get_player_image_url(player_id):
-    return f"https://cdn.nba.com/headshots/nba/latest/1040x760/{player_id}.png"
-
+# Processed player rows per game, reused across polls
+leaderboard = IncrementalLeaderboard()
 
-def parse_iso_duration(duration):
-    """Parse ISO duration format (e.g. PT34M51.02S) into minutes and seconds"""
-    if not duration or duration == "PT00M00.00S":
-        return 0.0
 
+def fetch_live(endpoint, stage, timeout):
+    """Fetch and parse one live endpoint, timing the request and the parse"""
+    with metrics.span(stage):
+        response = NBALiveHTTP().send_api_request(
+            endpoint=endpoint, parameters={}, timeout=timeout
+        )
+    with metrics.span("parse"):
+        response.get_dict()
+    return response
+
+
+def fetch_box_score(game_id, timeout=BOXSCORE_TIMEOUT):
+    """Fetch a single live box score and return its response"""
+    return fetch_live(
+        boxscore.BoxScore.endpoint_url.format(game_id=game_id),
+        "boxscore_fetch",
+        timeout,
+    )
+
+
+def fetch_box_scores(
+    game_ids, max_workers=BOXSCORE_MAX_WORKERS, timeout=BOXSCORE_TIMEOUT
+):
+    """Fetch box scores for several games concurrently.
+
+    Returns a dict mapping game id to either the box score response or the
+    exception raised while fetching it, so one failing game does not
+    affect the others. `timeout` is passed to each request, and the whole
+    batch gets one deadline of `timeout` per wave of `max_workers` games,
+    counted from submission, so a game that starts late in its wave gets
+    less than `timeout`. A game still pending at the deadline maps to a
+    TimeoutError and is abandoned rather than holding up the handler.
+    """
+    results = {}
+    if not game_ids:
+        return results
+
+    workers = max(1, min(max_workers, len(game_ids)))
+    deadline = timeout * math.ceil(len(game_ids) / workers)
+    executor = ThreadPoolExecutor(max_workers=workers)
     try:
-        duration = duration.replace("PT", "").replace("S", "")
-        parts = duration.split("M")
-        minutes = float(parts[0])
-        seconds = float(parts[1]) if len(parts) > 1 else 0
-        return minutes + (seconds / 60)
-    except:
-        return 0.0
-
+        futures = {
+            game_id: executor.submit(fetch_box_score, game_id, timeout)
+            for game_id in game_ids
+        }
+        done, _ = wait(futures.values(), timeout=deadline)
+        for game_id, future in futures.items():
+            if future not in done:
+                future.cancel()
+                results[game_id] = TimeoutError(
+                    f"Box score for game {game_id} missed the {deadline:g}s deadline"
+                )
+                continue
+            try:
+                results[game_id] = future.result()
+            except Exception as e:
+                results[game_id] = e
+    finally:
+        executor.shutdown(wait=False)
+    return results
 
-def format_iso_duration(duration):
-    """Format ISO duration format (e.g. PT34M51.02S) into MM:SS"""
-    if not duration or duration == "PT00M00.00S":
-        return "0:00"
 
-    try:
-        duration = duration.replace("PT", "").replace("S", "")
-        parts = duration.split("M")
-        minutes = int(float(parts[0]))
-        seconds = int(float(parts[1])) if len(parts) > 1 else 0
-        return f"{minutes}:{seconds:02d}"
-    except:
-        return "0:00"
+def get_todays_stats():
+    with metrics.span("total"):
+        return _get_todays_stats()
 
 
-def get_todays_stats():
+def _get_todays_stats():
     start_time = time.time()
     logger.info("Starting stats fetch")
 
     try:
         logger.info("Fetching scoreboard data...")
-        games = scoreboard.ScoreBoard()
-        games_dict = games.get_dict()
+        games_dict = fetch_live(
+            scoreboard.ScoreBoard.endpoint_url, "scoreboard_fetch", SCOREBOARD_TIMEOUT
+        ).get_dict()
 
         logger.info(f"Found {len(games_dict['scoreboard']['games'])} games")
 
@@ -135,116 +191,35 @@ def get_todays_stats():
                 "message": "No games are currently active or completed. Check back later for today's stats.",
             }
 
-        all_player_stats = []
-        has_valid_stats = False
+        logger.info(f"Fetching {len(active_games)} box scores concurrently")
+        with metrics.span("boxscore_fanout"):
+            box_scores = fetch_box_scores([game["gameId"] for game in active_games])
+        leaderboard.retain(box_scores)
 
-        # Process each active game
+        # Process each active game, skipping the ones whose box score is unchanged
         for game in active_games:
             game_id = game["gameId"]
             try:
-                logger.info(f"Processing game {game_id} (status: {game['gameStatus']})")
-
-                box = boxscore.BoxScore(game_id)
-                box_data = box.get_dict()
-
-                players_data = []
-
-                # Add home team players
-                for player in box_data["game"]["homeTeam"]["players"]:
-                    if player["statistics"]["minutes"] != "PT00M00.00S":
-                        player_dict = {
-                            "PLAYER_NAME": player["name"],
-                            "PLAYER_ID": player["personId"],
-                            "TEAM_ABBREVIATION": game["homeTeam"]["teamTricode"],
-                            "MIN": player["statistics"]["minutes"],
-                            "PTS": player["statistics"]["points"],
-                            "REB": player["statistics"]["reboundsTotal"],
-                            "AST": player["statistics"]["assists"],
-                            "STL": player["statistics"]["steals"],
-                            "BLK": player["statistics"]["blocks"],
-                            "TO": player["statistics"]["turnovers"],
-                            "FGM": player["statistics"]["fieldGoalsMade"],
-                            "FGA": player["statistics"]["fieldGoalsAttempted"],
-                            "FG3M": player["statistics"]["threePointersMade"],
-                            "FG3A": player["statistics"]["threePointersAttempted"],
-                            "FTM": player["statistics"]["freeThrowsMade"],
-                            "FTA": player["statistics"]["freeThrowsAttempted"],
-                        }
-                        players_data.append(player_dict)
-
-                # Add away team players
-                for player in box_data["game"]["awayTeam"]["players"]:
-                    if player["statistics"]["minutes"] != "PT00M00.00S":
-                        player_dict = {
-                            "PLAYER_NAME": player["name"],
-                            "PLAYER_ID": player["personId"],
-                            "TEAM_ABBREVIATION": game["awayTeam"]["teamTricode"],
-                            "MIN": player["statistics"]["minutes"],
-                            "PTS": player["statistics"]["points"],
-                            "REB": player["statistics"]["reboundsTotal"],
-                            "AST": player["statistics"]["assists"],
-                            "STL": player["statistics"]["steals"],
-                            "BLK": player["statistics"]["blocks"],
-                            "TO": player["statistics"]["turnovers"],
-                            "FGM": player["statistics"]["fieldGoalsMade"],
-                            "FGA": player["statistics"]["fieldGoalsAttempted"],
-                            "FG3M": player["statistics"]["threePointersMade"],
-                            "FG3A": player["statistics"]["threePointersAttempted"],
-                            "FTM": player["statistics"]["freeThrowsMade"],
-                            "FTA": player["statistics"]["freeThrowsAttempted"],
-                        }
-                        players_data.append(player_dict)
-
-                if players_data:
-                    player_stats = pd.DataFrame(players_data)
-                    has_valid_stats = True
-                    logger.info(f"Found valid stats for game {game_id}")
-
-                    game_status = (
-                        "Final"
-                        if game["gameStatus"] == 3
-                        else f"Q{game['period']} {game['gameStatusText']}"
-                    )
-                    player_stats["GAME_STATUS"] = game_status
-
-                    player_stats["FG_PCT"] = pd.Series(
-                        np.where(
-                            player_stats["FGA"] > 0,
-                            (player_stats["FGM"] / player_stats["FGA"] * 100).round(1),
-                            0,
-                        )
-                    ).fillna(0)
-
-                    player_stats["FG3_PCT"] = pd.Series(
-                        np.where(
-                            player_stats["FG3A"] > 0,
-                            (player_stats["FG3M"] / player_stats["FG3A"] * 100).round(
-                                1
-                            ),
-                            0,
-                        )
-                    ).fillna(0)
-
-                    player_stats["FT_PCT"] = pd.Series(
-                        np.where(
-                            player_stats["FTA"] > 0,
-                            (player_stats["FTM"] / player_stats["FTA"] * 100).round(1),
-                            0,
-                        )
-                    ).fillna(0)
-
-                    logger.info(
-                        f"Game {game_id} processed stats shape: {player_stats.shape}"
-                    )
-                    all_player_stats.append(player_stats)
-                    logger.info(f"Successfully processed game {game_id}")
+                logger.debug(
+                    f"Processing game {game_id} (status: {game['gameStatus']})"
+                )
+
+                response = box_scores[game_id]
+                if isinstance(response, Exception):
+                    raise response
+
+                if leaderboard.update_game(game, response):
+                    metrics.BOX_SCORES.inc(result="rebuilt")
+                    logger.debug(f"Rebuilt player stats for game {game_id}")
                 else:
-                    logger.info(f"No player data available for game {game_id}")
+                    metrics.BOX_SCORES.inc(result="unchanged")
+                    logger.debug(f"Box score unchanged for game {game_id}")
             except Exception as e:
+                metrics.BOX_SCORES.inc(result="error")
                 log_error(f"Error processing game {game_id}", e)
                 continue
 
-        if not all_player_stats:
+        if not leaderboard.has_stats():
             logger.warning("No player statistics available")
             return {
                 "stats": {},
@@ -252,91 +227,8 @@ def get_todays_stats():
                 "message": "No player statistics available yet",
             }
 
-        if not has_valid_stats:
-            logger.warning("Games are in progress but no valid statistics yet")
-            return {
-                "stats": {},
-                "games": live_games,
-                "message": "Games are currently in progress, but statistics are not yet available. Please check back in a few minutes.",
-            }
-
-        logger.info("Combining all player stats")
-        combined_stats = pd.concat(all_player_stats)
-        logger.info(f"Combined stats shape: {combined_stats.shape}")
-
-        combined_stats["MIN_SORT"] = combined_stats["MIN"].apply(parse_iso_duration)
-        combined_stats["MIN"] = combined_stats["MIN"].apply(format_iso_duration)
-
-        categories = {
-            "Points": "PTS",
-            "Rebounds": "REB",
-            "Assists": "AST",
-            "Steals": "STL",
-            "Blocks": "BLK",
-            "Minutes": "MIN",
-            "Turnovers": "TO",
-            "Field Goal %": "FG_PCT",
-            "3-Point %": "FG3_PCT",
-            "Free Throw %": "FT_PCT",
-        }
-
-        results = {}
         logger.info("Processing statistics by category")
-
-        for category_name, column in categories.items():
-            try:
-                logger.info(f"Processing {category_name} category with column {column}")
-                if category_name == "Minutes":
-                    top_players = combined_stats.nlargest(30, "MIN_SORT", keep="all")
-                elif category_name in ["Field Goal %", "3-Point %", "Free Throw %"]:
-                    attempts_col = {
-                        "Field Goal %": "FGA",
-                        "3-Point %": "FG3A",
-                        "Free Throw %": "FTA",
-                    }[category_name]
-                    made_col = attempts_col.replace("A", "M")
-                    valid_players = combined_stats[
-                        (combined_stats[attempts_col] >= 3)
-                        & (combined_stats["MIN_SORT"] > 0)
-                    ]
-                    if len(valid_players) > 0:
-                        top_players = valid_players.nlargest(30, column, keep="all")
-                    else:
-                        top_players = pd.DataFrame()
-                else:
-                    active_players = combined_stats[combined_stats["MIN_SORT"] > 0]
-                    top_players = active_players.nlargest(30, column, keep="all")
-
-                results[category_name] = []
-
-                for _, player in top_players.iterrows():
-                    if category_name == "Minutes":
-                        value = player["MIN"]
-                    elif category_name in ["Field Goal %", "3-Point %", "Free Throw %"]:
-                        attempts_col = {
-                            "Field Goal %": "FGA",
-                            "3-Point %": "FG3A",
-                            "Free Throw %": "FTA",
-                        }[category_name]
-                        made_col = attempts_col.replace("A", "M")
-                        pct = player[column]
-                        made = int(player[made_col])
-                        attempts = int(player[attempts_col])
-                        value = f"{pct:.1f}% ({made}/{attempts})"
-                        logger.info(
-                            f"Percentage stat for {player['PLAYER_NAME']}: {value}"
-                        )
-                    else:
-                        value = str(int(player[column]))
-
-                    player_info = f"{player['PLAYER_NAME']} ({player['TEAM_ABBREVIATION']}) [{player['GAME_STATUS']}]: {value} ||| {get_player_image_url(player['PLAYER_ID'])}"
-                    results[category_name].append(player_info)
-                    logger.info(f"Added player info: {player_info}")
-
-                logger.info(f"Successfully processed {category_name} category")
-            except Exception as e:
-                log_error(f"Error processing {category_name} category", e)
-                continue
+        results = leaderboard.rankings()
 
         logger.info(f"Final results categories: {list(results.keys())}")
 
@@ -351,20 +243,103 @@ def get_todays_stats():
         return {"error": str(e), "games": []}
 
 
+@app.get("/api/python/stats")
+def stats_route():
+    return get_todays_stats()
+
+
+# One shared poller pushes changes to every /stats/stream client
+stats_stream = StatsStream(get_todays_stats)
+
+
+@app.get("/api/python/stats/stream")
+async def stats_stream_route():
+    return StreamingResponse(
+        stats_stream.subscribe(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Local season game logs, filled by `python3 api/python/history.py backfill`
+history_store = HistoryStore()
+
+
+@app.get("/api/python/history/players/{player_id}")
+def player_history_route(
+    player_id: int, season: str = Query(None, pattern=SEASON_PATTERN)
+):
+    return {
+        "season_average": history_store.season_average(player_id, season),
+        "career_highs": history_store.career_highs(player_id),
+    }
+
+
+@app.get("/api/python/stats/cache")
+def cache_stats_route():
+    return live_cache.get_stats()
+
+
+# Counters pulled from the HTTP layer and the live cache when /metrics is scraped
+UPSTREAM_METRICS = {
+    "requests": "Requests sent upstream",
+    "not_modified": "Upstream 304 Not Modified responses",
+    "retries": "Upstream retries made by urllib3",
+    "bytes": "Response body bytes received from upstream",
+}
+LIVE_CACHE_METRICS = {
+    "hits": "Live responses served from memory",
+    "disk_hits": "Live responses served from the disk cache",
+    "coalesced": "Live requests that waited on an in-flight fetch",
+    "misses": "Live requests that went upstream",
+    "evictions": "Live responses evicted to make room",
+}
+
+
+def collect_upstream_metrics():
+    upstream = http.get_stats()
+    cache = live_cache.get_stats()
+    collected = [
+        (f"nba_upstream_{key}_total", "counter", description, upstream[key])
+        for key, description in UPSTREAM_METRICS.items()
+    ]
+    collected += [
+        (f"live_cache_{key}_total", "counter", description, cache[key])
+        for key, description in LIVE_CACHE_METRICS.items()
+    ]
+    collected.append(
+        ("live_cache_entries", "gauge", "Live responses cached", cache["entries"])
+    )
+    return collected
+
+
+metrics.registry.add_collector(collect_upstream_metrics)
+
+
+@app.get("/metrics")
+def metrics_route():
+    return PlainTextResponse(
+        metrics.registry.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+def serve(host=None, port=None):
+    """Run the FastAPI app as a long-lived stats worker"""
+    import uvicorn
+
+    host = host or os.environ.get("STATS_WORKER_HOST", "127.0.0.1")
+    port = int(port or os.environ.get("STATS_WORKER_PORT", 8000))
+    logger.info(f"Starting stats worker on {host}:{port}")
+    uvicorn.run(app, host=host, port=port, log_level="info")
+
+
 if __name__ == "__main__":
+    if "--serve" in sys.argv:
+        serve()
+        sys.exit(0)
+
     try:
         result = get_todays_stats()
-        # Add CORS headers to the response
-        headers = {
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-            "Access-Control-Allow-Headers": "Content-Type",
-        }
-        # Print headers first
-        for key, value in headers.items():
-            print(f"{key}: {value}", file=sys.stdout)
-        print("\n", file=sys.stdout)  # Empty line after headers
-        # Print JSON response
         print(json.dumps(result), file=sys.stdout)
         sys.stdout.flush()
     except Exception as e:
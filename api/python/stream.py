@@ -0,0 +1,228 @@
+import asyncio
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Seconds between polls while at least one client is connected
+STREAM_POLL_INTERVAL = float(os.environ.get("STATS_STREAM_INTERVAL", 10))
+# Seconds of silence after which a keep-alive comment is sent
+STREAM_KEEPALIVE = 15
+# Frames buffered per client before it is resynced with a snapshot
+STREAM_QUEUE_SIZE = 16
+
+
+def format_event(event, data):
+    """Encode one server-sent event frame"""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def diff_fields(old, new):
+    """Keys of `new` whose values differ from `old`, recursing into dicts"""
+    changes = {}
+    for key, value in new.items():
+        previous = old.get(key)
+        if previous == value:
+            continue
+        if isinstance(value, dict) and isinstance(previous, dict):
+            changes[key] = diff_fields(previous, value)
+        else:
+            changes[key] = value
+    return changes
+
+
+def diff_games(old_games, new_games):
+    """Score, clock and status changes between two scoreboard game lists.
+
+    Returns None when nothing changed, otherwise a dict with any of
+    `changed` ({gameId: changed fields}), `added` (full games), `removed`
+    (game ids) and `order` (all game ids, when the remaining games followed
+    by the added ones are not already in order).
+    """
+    old_by_id = {game["gameId"]: game for game in old_games}
+    new_ids = [game["gameId"] for game in new_games]
+    kept = set(new_ids)
+
+    changes = {"changed": {}, "added": [], "removed": []}
+    for game in new_games:
+        previous = old_by_id.get(game["gameId"])
+        if previous is None:
+            changes["added"].append(game)
+            continue
+        fields = diff_fields(previous, game)
+        if fields:
+            changes["changed"][game["gameId"]] = fields
+    changes["removed"] = [game_id for game_id in old_by_id if game_id not in kept]
+    # Clients append added games after the remaining ones, then apply `order`
+    appended = [game_id for game_id in old_by_id if game_id in kept] + [
+        game["gameId"] for game in changes["added"]
+    ]
+    if appended != new_ids:
+        changes["order"] = new_ids
+
+    changes = {key: value for key, value in changes.items() if value}
+    return changes or None
+
+
+def diff_leaderboard(old_entries, new_entries):
+    """Entries that left and entered one category list.
+
+    Removing `left` from the old list and then inserting every `entered`
+    [index, entry] pair in order rebuilds the new list. When the entries
+    that stayed were reordered, the full list is sent as `set` instead.
+    """
+    old_set = set(old_entries)
+    new_set = set(new_entries)
+    if len(new_set) != len(new_entries) or len(old_set) != len(old_entries):
+        return None if old_entries == new_entries else {"set": list(new_entries)}
+
+    stayed = [entry for entry in old_entries if entry in new_set]
+    if stayed != [entry for entry in new_entries if entry in old_set]:
+        return {"set": list(new_entries)}
+
+    left = [entry for entry in old_entries if entry not in new_set]
+    entered = [
+        [index, entry]
+        for index, entry in enumerate(new_entries)
+        if entry not in old_set
+    ]
+    if not left and not entered:
+        return None
+    return {"left": left, "entered": entered}
+
+
+def diff_stats(old_stats, new_stats):
+    """Per-category leaderboard changes, or None when nothing changed.
+
+    A category that is no longer ranked maps to None.
+    """
+    changes = {}
+    for category, entries in new_stats.items():
+        if category not in old_stats:
+            changes[category] = {"set": list(entries)}
+            continue
+        change = diff_leaderboard(old_stats[category], entries)
+        if change is not None:
+            changes[category] = change
+    for category in old_stats:
+        if category not in new_stats:
+            changes[category] = None
+    return changes or None
+
+
+def diff_results(old, new):
+    """Changes between two stats payloads, or None when nothing changed"""
+    changes = {}
+    games = diff_games(old.get("games", []), new.get("games", []))
+    if games is not None:
+        changes["games"] = games
+    stats = diff_stats(old.get("stats", {}), new.get("stats", {}))
+    if stats is not None:
+        changes["stats"] = stats
+    if old.get("message") != new.get("message"):
+        changes["message"] = new.get("message")
+    return changes or None
+
+
+class StatsStream:
+    """Fans one upstream poller out to every connected event-stream client.
+
+    The poller runs only while a client is connected. Each poll is diffed
+    against the last published state and encoded once. Clients receive a
+    `snapshot` event on connect, `diff` events afterwards and an
+    `upstream_error` event when a poll fails, so upstream load and
+    per-client bandwidth do not grow with the number of viewers.
+    """
+
+    def __init__(
+        self,
+        fetch,
+        interval=STREAM_POLL_INTERVAL,
+        keepalive=STREAM_KEEPALIVE,
+        queue_size=STREAM_QUEUE_SIZE,
+    ):
+        self.fetch = fetch
+        self.interval = interval
+        self.keepalive = keepalive
+        self.queue_size = queue_size
+        self._subscribers = set()
+        self._state = None
+        self._seq = 0
+        self._task = None
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def _snapshot_frame(self):
+        return format_event("snapshot", {"seq": self._seq, **self._state})
+
+    async def subscribe(self):
+        """Async generator of event-stream frames for one client"""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._poll())
+        logger.info(f"Stream client connected ({self.subscriber_count} total)")
+        try:
+            if self._state is not None:
+                yield self._snapshot_frame()
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield frame
+        finally:
+            self._subscribers.discard(queue)
+            logger.info(f"Stream client disconnected ({self.subscriber_count} left)")
+
+    def publish(self, result):
+        """Diff one stats payload against the last one and queue the change"""
+        if "error" in result:
+            self._broadcast(format_event("upstream_error", {"error": result["error"]}))
+            return
+
+        if self._state is None:
+            self._state = result
+            self._seq += 1
+            self._broadcast(self._snapshot_frame())
+            return
+
+        changes = diff_results(self._state, result)
+        self._state = result
+        if changes is None:
+            return
+        self._seq += 1
+        self._broadcast(format_event("diff", {"seq": self._seq, **changes}))
+
+    def _broadcast(self, frame):
+        snapshot = None
+        for queue in self._subscribers:
+            if not queue.full():
+                queue.put_nowait(frame)
+                continue
+            # A client that fell behind drops its backlog and resyncs
+            while not queue.empty():
+                queue.get_nowait()
+            if self._state is not None:
+                snapshot = snapshot or self._snapshot_frame()
+                queue.put_nowait(snapshot)
+            else:
+                queue.put_nowait(frame)
+
+    async def _poll(self):
+        logger.info("Stream poller started")
+        while self._subscribers:
+            try:
+                result = await asyncio.to_thread(self.fetch)
+            except Exception as e:
+                logger.error(f"Stream poll failed: {e}", exc_info=True)
+                result = {"error": str(e)}
+            self.publish(result)
+            await asyncio.sleep(self.interval)
+        # Nobody is listening; the next client starts from a fresh poll
+        self._state = None
+        logger.info("Stream poller stopped")
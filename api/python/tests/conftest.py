@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The worker modules import each other as top-level siblings
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vendor_path  # noqa: F401,E402
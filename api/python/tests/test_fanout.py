@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+import benchmarks
+import stats
+from nba_api.live.nba.endpoints import boxscore
+from nba_api.live.nba.library.http import NBALiveHTTP
+
+
+@pytest.fixture
+def no_live_cache():
+    cache = NBALiveHTTP.cache
+    NBALiveHTTP.cache = None
+    yield
+    NBALiveHTTP.cache = cache
+
+
+def test_concurrent_fetch_beats_sequential():
+    result = benchmarks.bench_box_score_fanout(games=8, delay=0.2, min_speedup=3)
+    assert result["failed"] == []
+    assert result["concurrent"] < result["sequential"] / 3
+    assert result["ok"]
+
+
+def test_fanout_restores_live_cache(monkeypatch):
+    cache = NBALiveHTTP.cache
+
+    def fail(game_id):
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(stats, "fetch_box_score", fail)
+    with pytest.raises(RuntimeError):
+        benchmarks.bench_box_score_fanout(games=2, delay=0)
+    assert NBALiveHTTP.cache is cache
+
+
+def test_slow_box_score_times_out_alone(no_live_cache):
+    with benchmarks.StubCDNServer(boxscore.BoxScore.expected_data, delay=2):
+        start = time.perf_counter()
+        results = stats.fetch_box_scores(["0022400001", "0022400002"], timeout=0.3)
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 1
+    assert all(isinstance(result, Exception) for result in results.values())
@@ -0,0 +1,122 @@
+import json
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from nba_api.library.http import NBAResponse
+from nba_api.live.nba.library import cache as cache_module
+from nba_api.live.nba.library.cache import GAME_DAY_TZ, ResponseCache
+
+ENDPOINT = "boxscore/boxscore_0022400001.json"
+CLIENTS = 20
+
+
+def make_response(contents, status_code=200, url=None):
+    return NBAResponse(response=contents, status_code=status_code, url=url)
+
+
+def box_score(status):
+    return make_response(
+        json.dumps({"game": {"gameId": "0022400001", "gameStatus": status}}),
+        url="https://cdn.nba.com/static/json/liveData/" + ENDPOINT,
+    )
+
+
+def run_clients(cache, fetch):
+    """Call get_or_fetch from CLIENTS threads at once; returns their results"""
+    barrier = threading.Barrier(CLIENTS)
+    results = [None] * CLIENTS
+
+    def client(index):
+        barrier.wait()
+        try:
+            results[index] = cache.get_or_fetch(ENDPOINT, fetch, make_response)
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(CLIENTS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_misses_fetch_once():
+    cache = ResponseCache()
+    calls = []
+    response = box_score(2)
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return response
+
+    results = run_clients(cache, fetch)
+
+    assert len(calls) == 1
+    assert all(result is response for result in results)
+    stats = cache.get_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] + stats["coalesced"] == CLIENTS - 1
+
+
+def test_leader_error_reaches_every_waiter():
+    cache = ResponseCache()
+    calls = []
+    error = RuntimeError("upstream down")
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        raise error
+
+    results = run_clients(cache, fetch)
+
+    assert len(calls) == 1
+    assert all(result is error for result in results)
+    # A failure is not cached; the next request goes upstream again
+    cache.get_or_fetch(ENDPOINT, lambda: box_score(2), make_response)
+    assert cache.get_stats()["misses"] == 2
+
+
+def test_final_box_score_expires_at_eastern_midnight(monkeypatch):
+    tip_off = datetime(2024, 1, 15, 22, 30, tzinfo=GAME_DAY_TZ)
+
+    class GameNight(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return tip_off.astimezone(tz)
+
+    monkeypatch.setattr(cache_module, "datetime", GameNight)
+    cache = ResponseCache()
+    now = tip_off.timestamp()
+
+    final = cache.expires_at(ENDPOINT, box_score(3), now=now)
+    live = cache.expires_at(ENDPOINT, box_score(2), now=now)
+
+    # Midnight Eastern is 05:00 UTC in January
+    assert final == datetime(2024, 1, 16, 5, tzinfo=timezone.utc).timestamp()
+    assert live == now + cache.ttl_for(ENDPOINT)
+
+
+def test_disk_entry_reloads_in_a_new_cache(tmp_path):
+    response = box_score(3)
+    ResponseCache(directory=str(tmp_path)).get_or_fetch(
+        ENDPOINT, lambda: response, make_response
+    )
+
+    def fetch():
+        pytest.fail("a fresh disk entry should not go upstream")
+
+    cache = ResponseCache(directory=str(tmp_path))
+    loaded = cache.get_or_fetch(ENDPOINT, fetch, make_response)
+
+    assert loaded.get_response() == response.get_response()
+    assert loaded.get_url() == response.get_url()
+    assert cache.get_stats()["disk_hits"] == 1
+    # Reloaded entries are kept in memory, so the next lookup is a plain hit
+    assert cache.get_or_fetch(ENDPOINT, fetch, make_response) is loaded
+    assert cache.get_stats()["hits"] == 1
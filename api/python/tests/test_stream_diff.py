@@ -0,0 +1,169 @@
+"""The stream's diffs, applied the way lib/stats-stream.ts applies them"""
+
+import copy
+import random
+
+import pytest
+
+from stream import diff_results
+
+CATEGORIES = ("points", "rebounds", "assists", "steals")
+PLAYERS = [f"player-{index}" for index in range(12)]
+GAME_IDS = [f"00224000{index:02d}" for index in range(8)]
+MESSAGES = ("No player statistics available yet", "Check back later")
+
+
+# Port of applyStatsDiff and its helpers in lib/stats-stream.ts
+
+
+def merge_fields(target, changes):
+    merged = dict(target)
+    for key, value in changes.items():
+        current = merged.get(key)
+        if isinstance(value, dict) and isinstance(current, dict):
+            merged[key] = merge_fields(current, value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def apply_games_diff(games, diff):
+    removed = set(diff.get("removed", []))
+    changed = diff.get("changed", {})
+    updated = [
+        (
+            merge_fields(game, changed[game["gameId"]])
+            if game["gameId"] in changed
+            else game
+        )
+        for game in games
+        if game["gameId"] not in removed
+    ] + diff.get("added", [])
+
+    if "order" not in diff:
+        return updated
+    by_id = {game["gameId"]: game for game in updated}
+    return [by_id[game_id] for game_id in diff["order"] if game_id in by_id]
+
+
+def apply_category_diff(entries, diff):
+    if "set" in diff:
+        return diff["set"]
+    left = set(diff.get("left", []))
+    updated = [entry for entry in entries if entry not in left]
+    for index, entry in diff.get("entered", []):
+        updated.insert(index, entry)
+    return updated
+
+
+def apply_stats_diff(payload, diff):
+    result = dict(payload)
+    if "games" in diff:
+        result["games"] = apply_games_diff(payload.get("games", []), diff["games"])
+    if "stats" in diff:
+        stats = dict(payload.get("stats", {}))
+        for category, change in diff["stats"].items():
+            if change is None:
+                stats.pop(category, None)
+            else:
+                stats[category] = apply_category_diff(stats.get(category, []), change)
+        result["stats"] = stats
+    if "message" in diff:
+        if diff["message"] is None:
+            result.pop("message", None)
+        else:
+            result["message"] = diff["message"]
+    return result
+
+
+def random_team(rng):
+    return {
+        "teamTricode": rng.choice(("BOS", "LAL", "NYK")),
+        "score": rng.randrange(0, 130, 7),
+        "inBonus": rng.random() < 0.5,
+    }
+
+
+def random_game(rng, game_id):
+    return {
+        "gameId": game_id,
+        "gameStatus": rng.randint(1, 3),
+        "gameClock": rng.choice(("PT12M00.00S", "PT05M31.00S", "")),
+        "period": rng.randint(0, 4),
+        "homeTeam": random_team(rng),
+        "awayTeam": random_team(rng),
+    }
+
+
+def random_payload(rng):
+    game_ids = rng.sample(GAME_IDS, rng.randint(0, len(GAME_IDS)))
+    payload = {
+        "stats": {
+            category: (
+                [
+                    # Duplicates are rare in real leaderboards but must still apply
+                    rng.choice(PLAYERS)
+                    for _ in range(rng.randint(0, 6))
+                ]
+                if rng.random() < 0.1
+                else rng.sample(PLAYERS, rng.randint(0, 6))
+            )
+            for category in CATEGORIES
+            if rng.random() < 0.9
+        },
+        "games": [random_game(rng, game_id) for game_id in game_ids],
+    }
+    if rng.random() < 0.3:
+        payload["message"] = rng.choice(MESSAGES)
+    return payload
+
+
+def evolve(rng, payload):
+    """A payload a few changes away from `payload`, like the next poll's"""
+    new = copy.deepcopy(payload)
+    for game in new["games"]:
+        if rng.random() < 0.5:
+            team = game[rng.choice(("homeTeam", "awayTeam"))]
+            team["score"] += rng.choice((1, 2, 3))
+        if rng.random() < 0.3:
+            game["gameClock"] = rng.choice(("PT01M10.00S", "PT00M00.00S"))
+    if rng.random() < 0.2:
+        rng.shuffle(new["games"])
+    for category, entries in new["stats"].items():
+        if rng.random() < 0.3 and entries:
+            entries.pop(rng.randrange(len(entries)))
+        if rng.random() < 0.3:
+            player = rng.choice(PLAYERS)
+            if player not in entries:
+                entries.insert(rng.randint(0, len(entries)), player)
+        if rng.random() < 0.1:
+            rng.shuffle(entries)
+    if rng.random() < 0.1:
+        new.pop("message", None)
+    return new
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_client_rebuilds_random_payloads(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        old = random_payload(rng)
+        new = random_payload(rng) if rng.random() < 0.3 else evolve(rng, old)
+        changes = diff_results(old, new)
+
+        rebuilt = old if changes is None else apply_stats_diff(old, changes)
+
+        assert rebuilt == new
+
+
+def test_client_follows_a_stream_of_polls():
+    rng = random.Random(0)
+    server = random_payload(rng)
+    client = copy.deepcopy(server)
+    for _ in range(200):
+        new = evolve(rng, server)
+        changes = diff_results(server, new)
+        if changes is not None:
+            client = apply_stats_diff(client, changes)
+        server = new
+        assert client == server
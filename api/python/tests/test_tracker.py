@@ -0,0 +1,29 @@
+import itertools
+import json
+
+from nba_api.library.http import NBAResponse
+from nba_api.live.nba.library.tracker import PlayByPlayTracker
+
+
+def feed(*action_numbers):
+    actions = [
+        {"actionNumber": number, "orderNumber": order, "actionType": "jumpball"}
+        for order, number in enumerate(action_numbers, 1)
+    ]
+    body = {"game": {"gameId": "0022400001", "actions": actions}}
+    return NBAResponse(json.dumps(body), 200, None)
+
+
+def test_consumer_that_stops_early_gets_the_rest():
+    # In orderNumber order, action 4 comes before action 3
+    response = feed(1, 2, 4, 3, 5)
+    tracker = PlayByPlayTracker("0022400001")
+    first = [
+        action["actionNumber"] for action in itertools.islice(tracker.poll(response), 3)
+    ]
+    rest = [action["actionNumber"] for action in tracker.poll(response)]
+
+    assert first == [1, 2, 3]
+    assert rest == [4, 5]
+    assert tracker.state.actions == 5
+    assert tracker.revision == 0
@@ -0,0 +1,42 @@
+"""Make `nba_api` resolve to the patched copy in api/python/vendor/nba_api.
+
+Only the nba_api package is registered. The rest of vendor/ is a
+platform-specific bundle (its numpy is a macOS build), so vendor/ itself
+must never go on sys.path. Import this module before anything that
+imports nba_api.
+"""
+
+import importlib.util
+import os
+import sys
+
+VENDOR_NBA_API = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "vendor", "nba_api"
+)
+
+
+def use_vendored_nba_api():
+    module = sys.modules.get("nba_api")
+    if module is not None:
+        if os.path.dirname(os.path.abspath(module.__file__)) != VENDOR_NBA_API:
+            raise ImportError(
+                f"nba_api was imported from {module.__file__} before vendor_path"
+            )
+        return module
+
+    spec = importlib.util.spec_from_file_location(
+        "nba_api",
+        os.path.join(VENDOR_NBA_API, "__init__.py"),
+        submodule_search_locations=[VENDOR_NBA_API],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["nba_api"] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules["nba_api"]
+        raise
+    return module
+
+
+use_vendored_nba_api()
@@ -0,0 +1,7 @@
+import { proxyStreamToStatsWorker } from "@/lib/stats-worker";
+
+export const dynamic = "force-dynamic";
+
+export async function GET(request: Request): Promise<Response> {
+  return proxyStreamToStatsWorker(request.signal);
+}
@@ -7,6 +7,7 @@ import Image from "next/image";
 import { IntroAnimation } from "./intro-animation";
 import { motion } from "framer-motion";
 import { LiveScores } from "./live-scores";
+import { applyStatsDiff, StatsPayload } from "@/lib/stats-stream";
 
 interface Stats {
   [key: string]: string[];
@@ -77,6 +78,34 @@ export function LeaderboardDashboard() {
 
   useEffect(() => {
     let isMounted = true;
+    let interval: ReturnType<typeof setInterval> | null = null;
+    let source: EventSource | null = null;
+    let streamed: StatsPayload<Game> | null = null;
+
+    const showData = (data: StatsPayload<Game>) => {
+      if (data.message) {
+        setError(data.message);
+        setLoading(false);
+        setGames(data.games || []);
+        return;
+      }
+
+      if (!data.stats || Object.keys(data.stats).length === 0) {
+        setError(
+          "No statistics available at the moment. Please check back later."
+        );
+        setLoading(false);
+        setGames(data.games || []);
+        return;
+      }
+
+      if (isMounted) {
+        setStats(data.stats);
+        setGames(data.games || []);
+        setLoading(false);
+        setError(null);
+      }
+    };
 
     const fetchStats = async () => {
       try {
@@ -91,29 +120,7 @@ export function LeaderboardDashboard() {
 
         const data = await response.json();
         console.log("Received data:", data);
-
-        if (data.message) {
-          setError(data.message);
-          setLoading(false);
-          setGames(data.games || []);
-          return;
-        }
-
-        if (!data.stats || Object.keys(data.stats).length === 0) {
-          setError(
-            "No statistics available at the moment. Please check back later."
-          );
-          setLoading(false);
-          setGames(data.games || []);
-          return;
-        }
-
-        if (isMounted) {
-          setStats(data.stats);
-          setGames(data.games || []);
-          setLoading(false);
-          setError(null);
-        }
+        showData(data);
       } catch (err) {
         console.error("Error fetching stats:", err);
         if (isMounted) {
@@ -125,12 +132,52 @@ export function LeaderboardDashboard() {
       }
     };
 
-    fetchStats();
-    // Refresh every 30 seconds if games are in progress
-    const interval = setInterval(fetchStats, 30000);
+    const startPolling = () => {
+      fetchStats();
+      // Refresh every 30 seconds if games are in progress
+      interval = setInterval(fetchStats, 30000);
+    };
+
+    if (typeof EventSource === "undefined") {
+      startPolling();
+    } else {
+      // The worker pushes a snapshot on connect, then only the changes
+      source = new EventSource("/api/stats/stream");
+      source.addEventListener("snapshot", (event) => {
+        streamed = JSON.parse((event as MessageEvent).data);
+        if (streamed) showData(streamed);
+      });
+      source.addEventListener("diff", (event) => {
+        if (!streamed) return;
+        streamed = applyStatsDiff(
+          streamed,
+          JSON.parse((event as MessageEvent).data)
+        );
+        showData(streamed);
+      });
+      source.addEventListener("upstream_error", (event) => {
+        const data = JSON.parse((event as MessageEvent).data);
+        console.error("Stats stream poll failed:", data.error);
+        // Keep showing the last snapshot; without one, report the failure
+        // until a later poll succeeds and sends the first snapshot
+        if (!streamed && isMounted) {
+          setError(data.error || "Failed to fetch stats");
+          setLoading(false);
+        }
+      });
+      source.onerror = () => {
+        // Reconnects are automatic; a refused stream falls back to polling
+        if (source && source.readyState === EventSource.CLOSED) {
+          source = null;
+          startPolling();
+        }
+      };
+    }
+
     return () => {
       isMounted = false;
-      clearInterval(interval);
+      source?.close();
+      if (interval) clearInterval(interval);
     };
   }, []);
 
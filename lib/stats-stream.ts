@@ -0,0 +1,109 @@
+// Client side of the worker's /api/python/stats/stream server-sent events
+
+type Fields = Record<string, unknown>;
+
+export interface StreamGame {
+  gameId: string;
+}
+
+export interface StatsPayload<G extends StreamGame = StreamGame> {
+  stats?: { [category: string]: string[] };
+  games?: G[];
+  message?: string | null;
+}
+
+interface GamesDiff<G extends StreamGame> {
+  changed?: { [gameId: string]: Fields };
+  added?: G[];
+  removed?: string[];
+  order?: string[];
+}
+
+interface CategoryDiff {
+  set?: string[];
+  left?: string[];
+  entered?: [number, string][];
+}
+
+export interface StatsDiff<G extends StreamGame = StreamGame> {
+  games?: GamesDiff<G>;
+  stats?: { [category: string]: CategoryDiff | null };
+  message?: string | null;
+}
+
+const isObject = (value: unknown): value is Fields =>
+  typeof value === "object" && value !== null && !Array.isArray(value);
+
+const mergeFields = <T extends object>(target: T, changes: Fields): T => {
+  const merged = { ...target } as Fields;
+  Object.entries(changes).forEach(([key, value]) => {
+    const current = merged[key];
+    merged[key] =
+      isObject(value) && isObject(current) ? mergeFields(current, value) : value;
+  });
+  return merged as T;
+};
+
+const applyGamesDiff = <G extends StreamGame>(
+  games: G[],
+  diff: GamesDiff<G>
+): G[] => {
+  const removed = new Set(diff.removed || []);
+  const changed = diff.changed || {};
+  const updated = games
+    .filter((game) => !removed.has(game.gameId))
+    .map((game) =>
+      changed[game.gameId] ? mergeFields(game, changed[game.gameId]) : game
+    )
+    .concat(diff.added || []);
+
+  if (!diff.order) return updated;
+  const byId = new Map(updated.map((game) => [game.gameId, game]));
+  return diff.order
+    .map((gameId) => byId.get(gameId))
+    .filter((game): game is G => game !== undefined);
+};
+
+const applyCategoryDiff = (entries: string[], diff: CategoryDiff): string[] => {
+  if (diff.set) return diff.set;
+  const left = new Set(diff.left || []);
+  const updated = entries.filter((entry) => !left.has(entry));
+  (diff.entered || []).forEach(([index, entry]) => {
+    updated.splice(index, 0, entry);
+  });
+  return updated;
+};
+
+// Returns the payload the worker's JSON route would have returned
+export function applyStatsDiff<G extends StreamGame>(
+  payload: StatsPayload<G>,
+  diff: StatsDiff<G>
+): StatsPayload<G> {
+  const next: StatsPayload<G> = { ...payload };
+
+  if (diff.games) {
+    next.games = applyGamesDiff(payload.games || [], diff.games);
+  }
+
+  if (diff.stats) {
+    const stats = { ...(payload.stats || {}) };
+    Object.entries(diff.stats).forEach(([category, change]) => {
+      if (change === null) {
+        delete stats[category];
+      } else {
+        stats[category] = applyCategoryDiff(stats[category] || [], change);
+      }
+    });
+    next.stats = stats;
+  }
+
+  if ("message" in diff) {
+    if (diff.message == null) {
+      delete next.message;
+    } else {
+      next.message = diff.message;
+    }
+  }
+
+  return next;
+}
@@ -0,0 +1,76 @@
+import { NextResponse } from "next/server";
+
+// Long-lived Python worker started with `python3 api/python/stats.py --serve`.
+// On Vercel nothing listens locally, so default to the deployment's own
+// /api/python/stats function.
+const DEFAULT_STATS_WORKER_URL = process.env.VERCEL_URL
+  ? `https://${process.env.VERCEL_URL}/api/python/stats`
+  : "http://127.0.0.1:8000/api/python/stats";
+const STATS_WORKER_URL =
+  process.env.STATS_WORKER_URL || DEFAULT_STATS_WORKER_URL;
+const STATS_WORKER_STREAM_URL =
+  process.env.STATS_WORKER_STREAM_URL || `${STATS_WORKER_URL}/stream`;
+
+export async function proxyToStatsWorker(): Promise<Response> {
+  try {
+    const response = await fetch(STATS_WORKER_URL, { cache: "no-store" });
+
+    if (!response.ok) {
+      console.error("Stats worker responded with status:", response.status);
+      return NextResponse.json(
+        { error: "Failed to fetch stats from Python worker" },
+        { status: 500 }
+      );
+    }
+
+    const data = await response.json();
+    const proxied = NextResponse.json(data);
+    proxied.headers.set("Access-Control-Allow-Origin", "*");
+    proxied.headers.set("Access-Control-Allow-Methods", "GET, POST, OPTIONS");
+    proxied.headers.set("Access-Control-Allow-Headers", "Content-Type");
+    return proxied;
+  } catch (error) {
+    console.error("Error reaching stats worker:", error);
+    return NextResponse.json(
+      { error: "Failed to fetch stats. Please try again later." },
+      { status: 500 }
+    );
+  }
+}
+
+// Pass the worker's server-sent event stream through without buffering
+export async function proxyStreamToStatsWorker(
+  signal: AbortSignal
+): Promise<Response> {
+  try {
+    const response = await fetch(STATS_WORKER_STREAM_URL, {
+      cache: "no-store",
+      headers: { Accept: "text/event-stream" },
+      signal,
+    });
+
+    if (!response.ok || !response.body) {
+      console.error("Stats stream responded with status:", response.status);
+      return NextResponse.json(
+        { error: "Failed to open stats stream from Python worker" },
+        { status: 502 }
+      );
+    }
+
+    return new Response(response.body, {
+      headers: {
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache, no-transform",
+        Connection: "keep-alive",
+        "X-Accel-Buffering": "no",
+        "Access-Control-Allow-Origin": "*",
+      },
+    });
+  } catch (error) {
+    console.error("Error reaching stats stream:", error);
+    return NextResponse.json(
+      { error: "Failed to open stats stream. Please try again later." },
+      { status: 502 }
+    );
+  }
+}